@@ -3,6 +3,79 @@ import gpu
 from gpu_extras.batch import batch_for_shader
 import blf
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+_RECT_INDICES = ((0, 1, 2), (2, 3, 0))
+_IMAGE_TEXCOORDS = ((0, 0), (0, 1), (1, 1), (1, 0))
+
+
+def _rectangle(left_bottom: tuple[int, int], right_top: tuple[int, int]):
+    vertices = (left_bottom, (left_bottom[0], right_top[1]), right_top, (right_top[0], left_bottom[1]))
+    return vertices, _RECT_INDICES
+
+
+def _create_overlay_shader() -> gpu.types.GPUShader:
+    """
+    Compiles a shader that draws either a flat color or a texture,
+    so the loading bar and image share a single bind.
+    """
+    interface = gpu.types.GPUStageInterfaceInfo("batch_modal_overlay_interface")
+    interface.smooth("VEC2", "uv_interp")
+
+    info = gpu.types.GPUShaderCreateInfo()
+    info.push_constant("MAT4", "ModelViewProjectionMatrix")
+    info.push_constant("VEC4", "color")
+    info.push_constant("INT", "use_texture")
+    info.push_constant("BOOL", "srgbTarget")  # Set by Blender on bind, like for the built-in shaders
+    info.sampler(0, "FLOAT_2D", "image")
+    info.vertex_in(0, "VEC2", "pos")
+    info.vertex_in(1, "VEC2", "texCoord")
+    info.vertex_out(interface)
+    info.fragment_out(0, "VEC4", "FragColor")
+    info.vertex_source(
+        "void main() { uv_interp = texCoord; gl_Position = ModelViewProjectionMatrix * vec4(pos, 0.0, 1.0); }"
+    )
+    # NOTE: Only the flat color goes through the sRGB conversion, matching the built-in UNIFORM_COLOR and IMAGE
+    info.fragment_source(
+        """
+        vec4 overlay_srgb_to_framebuffer_space(vec4 in_color)
+        {
+            if (srgbTarget) {
+                vec3 c = max(in_color.rgb, vec3(0.0));
+                vec3 c1 = c * (1.0 / 12.92);
+                vec3 c2 = pow((c + 0.055) * (1.0 / 1.055), vec3(2.4));
+                in_color.rgb = mix(c1, c2, step(vec3(0.04045), c));
+            }
+            return in_color;
+        }
+
+        void main()
+        {
+            FragColor = use_texture != 0 ? texture(image, uv_interp) : overlay_srgb_to_framebuffer_space(color);
+        }
+        """
+    )
+    return gpu.shader.create_from_info(info)
+
+
+_shared_overlay_shader = None
+_shared_overlay_shader_compiled = False
+
+
+def _get_overlay_shader() -> gpu.types.GPUShader | None:
+    """
+    Compiles the overlay shader on first use and reuses it afterwards, returns None if it failed to compile.
+    """
+    global _shared_overlay_shader, _shared_overlay_shader_compiled
+    if not _shared_overlay_shader_compiled:
+        _shared_overlay_shader_compiled = True
+        try:
+            _shared_overlay_shader = _create_overlay_shader()
+        except Exception as e:
+            print(f"BatchModal: overlay shader failed to compile, using the built-in shaders instead: {e}")
+    return _shared_overlay_shader
 
 
 # ——————————————————————————————————————————————————————————————————————
@@ -16,8 +89,18 @@ class BatchModal:  # MARK: BatchModal
     A helper class for batch operations with a loading bar, image preview, status message and estimated time.
     """
 
-    data_to_empty = []
-    interval_seconds = 1.0
+    # Assign a sequence of data in 'warmup', the immutable shared default can't collect items across runs
+    data_to_empty = ()
+    interval_seconds = 0.01
+    # Items are processed per timer tick until this is exceeded, 0.0 processes one item per tick
+    tick_budget_seconds = 0.05
+    # Weight of the latest tick in the estimated time, higher values follow recent throughput more closely
+    eta_smoothing = 0.2
+    # Caps how often the overlay area is repainted, independent of 'interval_seconds'
+    redraw_interval_seconds = 0.1
+
+    io_bound = False  # Runs 'io_process' on worker threads and hands the results to 'finalize_on_main'
+    max_workers = 4
 
     overlay_area_type = "VIEW_3D"
 
@@ -34,14 +117,42 @@ class BatchModal:  # MARK: BatchModal
     # NOTE: Behind the scenes, read-only
     _timer = None
     _total_items = 0
+    _processed = 0
     _progress = 0.0
     _start_time = 0.0
     _estimated_time = 0.0
+    _ema_per_item = 0.0
+    _last_item_time = 0.0
+    _last_redraw = 0.0
+    _finishing = False
+
+    _pool = None
+    _inflight = None
 
     _overlay_area = None
     _overlay_space_type = None
     _overlay_draw_handler = None
 
+    _bar_shader = None
+    _image_shader = None
+    _overlay_shader = None
+    _unit_bar_batch = None
+    _image_batch_cache = None
+    _image_batch_key = None
+    _image_texture = None
+    _image_texture_src = None
+
+    _last_drawn_eta_int = None
+    _eta_cached_str = ""
+    _status_prefix = ""
+
+    # Method names rather than functions, so subclasses overriding a handler are dispatched to
+    _modal_event_handlers = {
+        "TIMER": "_modal_timer",
+        "RET": "_modal_return",
+        "ESC": "_modal_escape",
+    }
+
     # (Example) Callback function for the 'search' parameter for StringProperty
     def collection_names(self, context, edit_text):
         collections = bpy.data.collections
@@ -49,7 +160,12 @@ class BatchModal:  # MARK: BatchModal
 
     def invoke(self, context: bpy.types.Context, event: bpy.types.Event) -> set[str]:
         wm = context.window_manager
-        self._overlay_area = next((a for a in context.screen.areas if a.type == self.overlay_area_type), None)
+        area = context.area
+        if area is None or area.type != self.overlay_area_type:
+            area = next((a for a in context.screen.areas if a.type == self.overlay_area_type), None)
+        if area is None:
+            self.report({"WARNING"}, f"No {self.overlay_area_type} area found, running without overlay")
+        self._overlay_area = area
 
         if self.use_props_dialog:
             return wm.invoke_props_dialog(self)
@@ -73,10 +189,38 @@ class BatchModal:  # MARK: BatchModal
         wm = context.window_manager
         self.warmup(context)
 
-        self.data_to_empty = self.data_to_empty[:]
         self._total_items = len(self.data_to_empty)
+        self.data_to_empty = deque(self.data_to_empty)
+        self._processed = 0
+
+        self._inflight = deque()
+        if self.io_bound:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._submit_io_items()
 
         if self._overlay_area is not None:
+            # Shaders and batches are cached here so the draw handler doesn't allocate on every redraw
+            self._overlay_shader = _get_overlay_shader()
+            if self._overlay_shader is not None:
+                self._bar_shader = self._image_shader = self._overlay_shader
+            else:  # Fall back to the built-in shaders if the custom one can't be compiled
+                self._bar_shader = gpu.shader.from_builtin("UNIFORM_COLOR")
+                self._image_shader = gpu.shader.from_builtin("IMAGE")
+
+            # A unit-width quad, scaled to the progress at draw time so its vertex buffer never changes
+            vertices, indices = _rectangle((0, 10), (1, 20))
+            content = {"pos": vertices}
+            if self._overlay_shader is not None:
+                content["texCoord"] = _IMAGE_TEXCOORDS
+            self._unit_bar_batch = batch_for_shader(self._bar_shader, "TRIS", content, indices=indices)
+            self._image_batch_cache = None
+            self._image_batch_key = None
+            self._image_texture = None
+            self._image_texture_src = None
+            self._last_drawn_eta_int = None
+            self._eta_cached_str = ""
+            self._status_prefix = f"{self.key_instructions}: {self.bl_idname}: "
+
             self._overlay_space_type = type(self._overlay_area.spaces[0])
             self._overlay_draw_handler = self._overlay_space_type.draw_handler_add(
                 self.draw_overlay, (), "WINDOW", "POST_PIXEL"
@@ -85,16 +229,60 @@ class BatchModal:  # MARK: BatchModal
         self._timer = wm.event_timer_add(self.interval_seconds, window=context.window)
         wm.modal_handler_add(self)
 
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
+        self._last_item_time = self._start_time
+        self._ema_per_item = 0.0
+        self._last_redraw = 0.0
+        self._finishing = False
         return {"RUNNING_MODAL"}
 
     def main_process(self, context: bpy.types.Context, datablock) -> None:
         """
         Processes the first datablock in the list until the list is empty.
+        Assigning a different 'self.image' updates the preview,
+        call 'invalidate_image_cache' if the same image is edited in place.
         """
         ...
         return None
 
+    def io_process(self, datablock):
+        """
+        Runs on a worker thread when 'io_bound' is enabled, don't touch any bpy data here.
+        The return value is passed on to 'finalize_on_main'.
+        """
+        ...
+        return datablock
+
+    def finalize_on_main(self, context: bpy.types.Context, result) -> None:
+        """
+        Receives the result of 'io_process' on the main thread when 'io_bound' is enabled,
+        calls 'main_process' by default.
+        """
+        self.main_process(context, result)
+        return None
+
+    def _submit_io_items(self) -> None:
+        # Keeps a few items queued per worker so they don't idle between timer ticks
+        while self.data_to_empty and len(self._inflight) < self.max_workers * 2:
+            self._inflight.append(self._pool.submit(self.io_process, self.data_to_empty.popleft()))
+        return None
+
+    def _shutdown_pool(self, wait: bool = False) -> None:
+        # NOTE: Only queued items are cancelled, 'wait' blocks until the ones already running have returned
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        return None
+
+    def invalidate_image_cache(self) -> None:
+        """
+        Forces the preview texture to be rebuilt on the next redraw,
+        call this after modifying the pixels of 'self.image'.
+        """
+        self._image_texture = None
+        self._image_texture_src = None
+        return None
+
     def undo_everything(self, context: bpy.types.Context) -> None:
         """
         Performs every necessary undo step to reset everything back to its original state.
@@ -113,101 +301,196 @@ class BatchModal:  # MARK: BatchModal
         """
         No overriding
         """
+        self._teardown(context)
+
+    def _teardown(self, context: bpy.types.Context) -> None:
+        """
+        Stops the workers, removes the overlay and the timer, safe to call more than once.
+        """
+        self._shutdown_pool()
         if self._overlay_draw_handler is not None:
             self._overlay_space_type.draw_handler_remove(self._overlay_draw_handler, "WINDOW")
+            self._overlay_draw_handler = None
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        return None
 
     def modal(self, context: bpy.types.Context, event: bpy.types.Event) -> set[str]:  # MARK: Modal
-        wm = context.window_manager
-        if event.type == "TIMER":
-            self.main_process(context, self.data_to_empty[0])
-            self.data_to_empty.pop(0)
-            processed_items = self._total_items - len(self.data_to_empty)
+        handler_name = self._modal_event_handlers.get(event.type)
+        if handler_name is None:
+            return {"RUNNING_MODAL"}
+        return getattr(self, handler_name)(context)
 
-            self._progress = processed_items / self._total_items
-
-            # Time estimation
-            elapsed_time = time.time() - self._start_time
-            average_time_per_item = elapsed_time / processed_items
-            self._estimated_time = average_time_per_item * (self._total_items - processed_items)
+    def _modal_timer(self, context: bpy.types.Context) -> set[str]:
+        if self._finishing:  # The completed state was painted since the previous tick
+            self.cleanup(context)
+            self._teardown(context)
+            return {"FINISHED"}
 
-            if self._overlay_draw_handler is not None:
-                self._overlay_area.tag_redraw()
+        # NOTE: Bound to locals since this runs on every tick,
+        # 'data_to_empty' must not be reassigned while running
+        now_fn = time.monotonic
+        queue = self.data_to_empty
+        inflight = self._inflight
+        area = self._overlay_area
+
+        now = now_fn()
+        deadline = now + self.tick_budget_seconds
+        processed_this_tick = 0
+        if self.io_bound:
+            finalize_on_main = self.finalize_on_main
+            # Finalised in submission order, so results are applied in the same order as 'data_to_empty'
+            while inflight and inflight[0].done():
+                try:
+                    result = inflight.popleft().result()
+                except Exception as e:  # Errors raised in 'io_process' surface here
+                    self._shutdown_pool(wait=True)
+                    self.undo_everything(context)
+                    self._teardown(context)
+                    self.report({"ERROR"}, f"{self.bl_idname}: {e}")
+                    return {"CANCELLED"}
+                finalize_on_main(context, result)
+                processed_this_tick += 1
+                now = now_fn()
+                if now >= deadline:
+                    break
+            self._submit_io_items()
+        else:
+            main_process = self.main_process
+            while queue:
+                main_process(context, queue.popleft())
+                processed_this_tick += 1
+                now = now_fn()
+                if now >= deadline:
+                    break
+        processed = self._processed + processed_this_tick
+        self._processed = processed
+        remaining_items = len(queue) + len(inflight)
+
+        total_items = self._total_items
+        self._progress = processed / total_items if total_items > 0 else 1.0
+
+        # Time estimation (exponential moving average of the time per item, so recent throughput dominates)
+        if processed_this_tick > 0:
+            dt = (now - self._last_item_time) / processed_this_tick
+            self._last_item_time = now
+
+            alpha = self.eta_smoothing
+            ema = self._ema_per_item
+            ema = alpha * dt + (1.0 - alpha) * ema if ema else dt
+            self._ema_per_item = ema
+            self._estimated_time = ema * remaining_items
 
-            if len(self.data_to_empty) < 1:
-                self.cleanup(context)
-                if self._overlay_draw_handler is not None:
-                    self._overlay_space_type.draw_handler_remove(self._overlay_draw_handler, "WINDOW")
-                wm.event_timer_remove(self._timer)
-                return {"FINISHED"}
+        if self._overlay_draw_handler is not None:
+            if now - self._last_redraw >= self.redraw_interval_seconds or not remaining_items:
+                area.tag_redraw()
+                self._last_redraw = now
 
-        if event.type == "RET":
-            self.cleanup(context)
+        if not remaining_items:
+            self._shutdown_pool()
             if self._overlay_draw_handler is not None:
-                self._overlay_space_type.draw_handler_remove(self._overlay_draw_handler, "WINDOW")
-            wm.event_timer_remove(self._timer)
+                # Keeps the overlay for one more tick so the redraw tagged above paints the 100% state
+                self._finishing = True
+                return {"RUNNING_MODAL"}
+            self.cleanup(context)
+            self._teardown(context)
             return {"FINISHED"}
-
-        if event.type == "ESC":
-            self.undo_everything(context)
-            if self._overlay_draw_handler is not None:
-                self._overlay_space_type.draw_handler_remove(self._overlay_draw_handler, "WINDOW")
-            wm.event_timer_remove(self._timer)
-            return {"CANCELLED"}
         return {"RUNNING_MODAL"}
 
+    def _modal_return(self, context: bpy.types.Context) -> set[str]:
+        self._shutdown_pool()  # Stopped before the hook so no queued 'io_process' starts while it runs
+        self.cleanup(context)
+        self._teardown(context)
+        return {"FINISHED"}
+
+    def _modal_escape(self, context: bpy.types.Context) -> set[str]:
+        self._shutdown_pool(wait=True)  # Running 'io_process' calls must finish before anything is undone
+        self.undo_everything(context)
+        self._teardown(context)
+        return {"CANCELLED"}
+
     def draw_overlay(self) -> None:  # MARK: Overlay
-        def rectangle(left_bottom: tuple[int, int], right_top: tuple[int, int]):
-            vertices = [left_bottom, (left_bottom[0], right_top[1]), right_top, (right_top[0], left_bottom[1])]
-            indices = [(0, 1, 2), (2, 3, 0)]
-            return vertices, indices
+        area = self._overlay_area
+        if area is None or area.width <= 0 or area.height <= 0 or area.type != self.overlay_area_type:
+            return None
 
-        # Loading bar
-        vertices, indices = rectangle((0, 10), (self._overlay_area.width * self._progress, 20))
+        w = area.width
+        h = area.height
+        progress = self._progress
+        bound_shader = None
 
-        shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-        batch = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-        shader.bind()
+        # Loading bar
+        bar_right = w * progress
+        if bar_right >= 1.0:
+            shader = self._bar_shader
+            shader.bind()
+            bound_shader = shader
 
-        r, g, b = self.progress_color
-        shader.uniform_float("color", (r, g, b, 1.0))
+            if self._overlay_shader is not None:
+                shader.uniform_int("use_texture", 0)
+            r, g, b = self.progress_color
+            shader.uniform_float("color", (r, g, b, 1.0))
 
-        batch.draw(shader)
+            with gpu.matrix.push_pop():
+                gpu.matrix.scale((bar_right, 1.0))
+                self._unit_bar_batch.draw(shader)
 
         # Image
+        # NOTE: Drawn before the text so both quads are drawn without rebinding the overlay shader
+        if self.image is not None:
+            shader = self._image_shader
+            key = (w, h)
+            # NOTE: Only depends on the area size, so progress updates never rebuild the image quad
+            if key != self._image_batch_key:
+                half = min(w * 0.5, h - 160) * 0.5
+                if half > 0.0:
+                    cx = w * 0.5
+                    left = cx - half
+                    right = cx + half
+                    top = 80 + 2 * half
+                    vertices, indices = _rectangle((left, 80), (right, top))
+
+                    self._image_batch_cache = batch_for_shader(
+                        shader, "TRIS", {"pos": vertices, "texCoord": _IMAGE_TEXCOORDS}, indices=indices
+                    )
+                else:
+                    self._image_batch_cache = None  # The area is too short to fit the preview
+                self._image_batch_key = key
+
+            batch = self._image_batch_cache
+            if batch is not None:
+                if bound_shader is not shader:
+                    shader.bind()
+
+                if self.image is not self._image_texture_src:
+                    self._image_texture = gpu.texture.from_image(self.image)
+                    self._image_texture_src = self.image
+                if self._overlay_shader is not None:
+                    shader.uniform_int("use_texture", 1)
+                shader.uniform_sampler("image", self._image_texture)
+
+                batch.draw(shader)
+
+        # Text
         if self.draw_overlay_text:
+            # NOTE: The time only changes once a second, so its string is formatted once per change
+            eta_int = int(self._estimated_time)
+            if eta_int != self._last_drawn_eta_int:
+                minutes, seconds = divmod(eta_int, 60)
+                hours, minutes = divmod(minutes, 60)
+                self._eta_cached_str = f"{hours}h:{minutes:02d}m:{seconds:02d}s"
+                self._last_drawn_eta_int = eta_int
+
             font_id = 0
             blf.color(font_id, 1.0, 1.0, 1.0, 1.0)
 
             blf.size(font_id, 15.0)
             blf.position(font_id, 20, 30, 0)
-            blf.draw(font_id, f"{self.key_instructions}: {self.bl_idname}: {self.progress_message}")
-
-            m, s = divmod(self._estimated_time, 60)
-            h, m = divmod(m, 60)
+            blf.draw(font_id, self._status_prefix + self.progress_message)
 
             blf.size(font_id, 20.0)
             blf.position(font_id, 20, 50, 0)
-            blf.draw(
-                font_id,
-                f"{int(self._progress * 100)}% Estimated time left: {int(h)}h:{int(m):02d}m:{int(s):02d}s",
-            )
-
-        # Text
-        if self.image is not None:
-            size = min(self._overlay_area.width * 0.5, self._overlay_area.height - 160)
-            left = self._overlay_area.width / 2 - size / 2
-            right = self._overlay_area.width / 2 + size / 2
-            vertices, indices = rectangle((left, 80), (right, 80 + size))
-
-            shader = gpu.shader.from_builtin("IMAGE")
-            batch = batch_for_shader(
-                shader, "TRIS", {"pos": vertices, "texCoord": ((0, 0), (0, 1), (1, 1), (1, 0))}, indices=indices
-            )
-            shader.bind()
-
-            texture = gpu.texture.from_image(self.image)
-            shader.uniform_sampler("image", texture)
-
-            batch.draw(shader)
+            blf.draw(font_id, f"{int(progress * 100)}% Estimated time left: {self._eta_cached_str}")
         return None
 # endregion
\ No newline at end of file